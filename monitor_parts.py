@@ -1,12 +1,23 @@
 import os
 import json
+import logging
 import pickle
+import functools
+import hashlib
+import math
+import re
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
 
 # Constants
 SPREADSHEET_ID = os.environ.get('SPREADSHEET_ID')
@@ -14,231 +25,372 @@ if not SPREADSHEET_ID:
     raise ValueError("SPREADSHEET_ID environment variable not set")
     
 SHEET_NAME = 'parts'
-RANGE = 'A1:H3'  # Adjust range to cover the parts data
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+# All ranges are fetched in a single batchGet call; the parts data must stay
+# first. Adjust or append ranges here rather than adding extra requests.
+RANGES = [f'{SHEET_NAME}!A1:H3']
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets.readonly',
+    'https://www.googleapis.com/auth/drive.metadata.readonly',
+]
 SERVICE_ACCOUNT_FILE = 'service-account.json'
+# googleapiclient retries 429/5xx responses with exponential backoff
+API_NUM_RETRIES = 5
+_WAT = ZoneInfo('Africa/Lagos')  # West Africa Time, used for alert timestamps
 
 # Set up data directory for state persistence
 DATA_DIR = os.path.join(os.getenv('GITHUB_WORKSPACE', os.getcwd()), '.data')
 os.makedirs(DATA_DIR, exist_ok=True)
-PREVIOUS_STATE_FILE = os.path.join(DATA_DIR, 'previous_parts_state.pickle')
+PREVIOUS_STATE_FILE = os.path.join(DATA_DIR, 'previous_parts_state.json')
+# Older versions pickled the state; it is migrated to JSON on first load
+LEGACY_STATE_FILE = os.path.join(DATA_DIR, 'previous_parts_state.pickle')
+LAST_MTIME_FILE = os.path.join(DATA_DIR, 'last_mtime.txt')
+# Bump when the layout of the saved state dict changes
+STATE_VERSION = 1
+# Matches display-formatted numbers such as "12.00" or "1,234.50" found in
+# state saved before values were fetched unformatted
+_LEGACY_NUM_RE = re.compile(r'^-?\d[\d,]*(?:\.\d+)?$').match
+
+# Shared HTTP session so webhook posts reuse the same keep-alive connection.
+# POST must be listed explicitly, urllib3 only retries idempotent methods by default.
+# Only retry when the message can't have been accepted: connection failures
+# and 429/503. Read errors and other 5xx may follow a delivered message, so
+# retrying them could post a duplicate alert.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(
+        connect=3,
+        read=0,
+        status=3,
+        other=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 503],
+        allowed_methods=frozenset(['POST'])
+    )
+))
 
 class APIError(Exception):
     """Custom exception for API related errors."""
     pass
 
+@dataclass(slots=True)
+class ParsedSheet:
+    """Part headers, their weights and the total weight from one sheet read."""
+    headers: list
+    values: list
+    total: object
+    digest: bytes
+
+def parse_sheet(data):
+    """Slice raw sheet rows into a ParsedSheet.
+
+    Based on the screenshot, the correct mapping is:
+    Row 1: [DATE, TOTAL WEIGHTS, value, value, value, value, value, value]
+    Row 2: [empty, PARTS TYPE, WINGS, LAPS, BREAST FILLET, BONES, TOTAL]
+    """
+    # Get part headers from row 2 (starting from column C which is index 2)
+    headers = []
+    if len(data) > 1 and len(data[1]) > 2:
+        headers = data[1][2:]  # Skip empty cell and PARTS TYPE
+    
+    # Get values from row 1 (starting from column C which is index 2)
+    values = []
+    total = None
+    if len(data) > 0:
+        if len(data[0]) > 2:
+            values = data[0][2:]  # Skip DATE and TOTAL WEIGHTS
+        if len(data[0]) > 1:
+            total = data[0][1]  # TOTAL WEIGHTS
+    
+    # Values without a header can't be reported, drop them here so consumers
+    # only ever see at most one value per header
+    if len(values) != len(headers):
+        logger.warning("Mismatch between parts (%d) and values (%d)", len(headers), len(values))
+        values = values[:len(headers)]
+    
+    # BLAKE2b rather than hash(): str hashes are salted per process, so
+    # they can't be compared across runs
+    row = [str(v).strip() for v in data[0]] if data else []
+    digest = hashlib.blake2b(
+        json.dumps(row, separators=(',', ':')).encode('utf-8'),
+        digest_size=16
+    ).digest()
+    
+    return ParsedSheet(headers=headers, values=values, total=total, digest=digest)
+
+@functools.lru_cache(maxsize=1)
+def _get_credentials():
+    """Load the service account credentials once per process."""
+    return service_account.Credentials.from_service_account_file(
+        SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+
+@functools.lru_cache(maxsize=1)
 def get_service():
-    """Create and return Google Sheets service object."""
+    """Create and return Google Sheets service object.
+
+    The service is built once per process and reused on later calls. The
+    discovery document bundled with google-api-python-client is used, so no
+    HTTP round-trip is needed to fetch it.
+    """
     try:
-        credentials = service_account.Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-        return build('sheets', 'v4', credentials=credentials)
+        return build('sheets', 'v4', credentials=_get_credentials(),
+                     cache_discovery=False, static_discovery=True)
     except Exception as e:
-        print(f"Error initializing Google Sheets service: {str(e)}")
+        logger.error("Error initializing Google Sheets service: %s", e)
         raise APIError("Failed to initialize Google Sheets service")
 
+@functools.lru_cache(maxsize=1)
+def get_drive_service():
+    """Create and return Google Drive service object used for file metadata."""
+    try:
+        return build('drive', 'v3', credentials=_get_credentials(),
+                     cache_discovery=False, static_discovery=True)
+    except Exception as e:
+        logger.error("Error initializing Google Drive service: %s", e)
+        raise APIError("Failed to initialize Google Drive service")
+
+def get_modified_time(drive_service):
+    """Return the spreadsheet's modifiedTime, or None if it can't be read."""
+    try:
+        result = drive_service.files().get(
+            fileId=SPREADSHEET_ID,
+            fields='modifiedTime',
+            supportsAllDrives=True
+        ).execute(num_retries=API_NUM_RETRIES)
+        return result.get('modifiedTime')
+    except Exception as e:
+        # Not fatal: without a timestamp we just do a full fetch
+        logger.warning("Could not read spreadsheet modified time: %s", e)
+        return None
+
+def load_previous_mtime():
+    """Load the spreadsheet modified time recorded on the last run."""
+    try:
+        if os.path.exists(LAST_MTIME_FILE):
+            with open(LAST_MTIME_FILE, 'r') as f:
+                return f.read().strip() or None
+        return None
+    except Exception as e:
+        logger.warning("Error loading previous modified time: %s", e)
+        return None
+
+def save_current_mtime(mtime):
+    """Record the spreadsheet modified time for the next run."""
+    try:
+        with open(LAST_MTIME_FILE, 'w') as f:
+            f.write(mtime)
+    except Exception as e:
+        # The next run will simply do a full fetch
+        logger.warning("Error saving modified time: %s", e)
+
 def get_sheet_data(service):
     """Fetch data from Google Sheet."""
-    print("Fetching data from sheet...")
+    logger.info("Fetching data from sheet...")
     try:
         sheet = service.spreadsheets()
-        result = sheet.values().get(
+        # UNFORMATTED_VALUE returns numbers as int/float rather than display
+        # strings, and the fields mask drops everything but the cell values.
+        result = sheet.values().batchGet(
             spreadsheetId=SPREADSHEET_ID,
-            range=f'{SHEET_NAME}!{RANGE}'
-        ).execute()
-        data = result.get('values', [])
+            ranges=RANGES,
+            valueRenderOption='UNFORMATTED_VALUE',
+            fields='valueRanges.values'
+        ).execute(num_retries=API_NUM_RETRIES)
+        # One list of rows per entry in RANGES, in request order
+        values_by_range = [vr.get('values', []) for vr in result.get('valueRanges', [])]
+        data = values_by_range[0] if values_by_range else []
         
         # Validate data structure
         if not data or len(data) < 3:
             raise APIError("Invalid data structure received from Google Sheets")
             
-        print("Data fetched successfully")
+        logger.info("Data fetched successfully")
         return data
     except HttpError as e:
-        print(f"Google Sheets API error: {str(e)}")
+        # Retryable statuses have already been retried by googleapiclient
+        logger.error("Google Sheets API error (HTTP %s): %s", e.resp.status, e)
         raise APIError("Failed to fetch data from Google Sheets")
     except Exception as e:
-        print(f"Unexpected error fetching sheet data: {str(e)}")
+        logger.error("Unexpected error fetching sheet data: %s", e)
         raise APIError("Unexpected error while fetching sheet data")
 
-def send_space_alert(webhook_url, changes, current_data):
+def _is_number(val):
+    """True for int/float cells; bool (checkbox/TRUE cells) is excluded."""
+    return isinstance(val, (int, float)) and not isinstance(val, bool)
+
+def _fmt_kg(val):
+    """Format a weight cell as kilograms, leaving non-numeric cells as text."""
+    return f"{val:,.2f} kg" if _is_number(val) else str(val)
+
+def _values_differ(old_val, new_val):
+    """Compare two cells, numerically with a tolerance when both are numbers."""
+    if _is_number(old_val) and _is_number(new_val):
+        return not math.isclose(old_val, new_val, rel_tol=1e-9, abs_tol=1e-9)
+    return str(old_val).strip() != str(new_val).strip()
+
+def send_space_alert(webhook_url, changes, current):
     """Send alert to Google Space."""
     try:
-        message = "🔔 *Parts Stock Weight Changes Detected*\n\n"
-        print("Preparing changes message")
-        message += "*Changes:*\n"
+        logger.debug("Preparing changes message")
+        parts = ["🔔 *Parts Stock Weight Changes Detected*\n\n", "*Changes:*\n"]
         for part, old_val, new_val in changes:
-            # Try to convert values to numbers with weight suffix
-            try:
-                old_val_str = f"{float(old_val):,.2f} kg" if str(old_val).strip().replace('.', '', 1).isdigit() else str(old_val)
-                new_val_str = f"{float(new_val):,.2f} kg" if str(new_val).strip().replace('.', '', 1).isdigit() else str(new_val)
-                message += f"• {part}: {old_val_str} → {new_val_str}\n"
-            except (ValueError, TypeError):
-                message += f"• {part}: {old_val} → {new_val}\n"
-        
-        message += "\n*Current Parts Weights:*\n"
-        
-        # Based on the screenshot, the correct mapping is:
-        # Row 1: [DATE, TOTAL WEIGHTS, value, value, value, value, value, value]
-        # Row 2: [empty, PARTS TYPE, WINGS, LAPS, BREAST FILLET, BONES, TOTAL]
+            parts.append(f"• {part}: {_fmt_kg(old_val)} → {_fmt_kg(new_val)}\n")
         
-        # Get part headers from row 2 (starting from column C which is index 2)
-        part_headers = []
-        if len(current_data) > 1 and len(current_data[1]) > 2:
-            part_headers = current_data[1][2:]  # Skip empty cell and PARTS TYPE
+        parts.append("\n*Current Parts Weights:*\n")
         
-        # Get values from row 1 (starting from column C which is index 2)
-        values = []
-        if len(current_data) > 0 and len(current_data[0]) > 2:
-            values = current_data[0][2:]  # Skip DATE and TOTAL WEIGHTS in row 1
-        
-        # Map values to headers
-        for i in range(min(len(part_headers), len(values))):
-            try:
-                # Format weight values
-                val = values[i]
-                if str(val).strip().replace('.', '', 1).isdigit():
-                    formatted_val = f"{float(val):,.2f} kg"
-                else:
-                    formatted_val = str(val)
-                message += f"• {part_headers[i]}: {formatted_val}\n"
-            except (ValueError, TypeError, IndexError) as e:
-                print(f"Error formatting part {i}: {str(e)}")
-                message += f"• {part_headers[i] if i < len(part_headers) else 'Unknown'}: {values[i] if i < len(values) else 'N/A'}\n"
+        # Map values to headers, parts without a weight show as N/A
+        values = current.values
+        for i, header in enumerate(current.headers):
+            val = values[i] if i < len(values) else 'N/A'
+            parts.append(f"• {header}: {_fmt_kg(val)}\n")
         
         # Get current time in WAT
-        wat_tz = pytz.timezone('Africa/Lagos')
-        current_time = datetime.now(pytz.UTC).astimezone(wat_tz)
-        message += f"\n_Updated at: {current_time.strftime('%Y-%m-%d %I:%M:%S %p')} WAT_"
+        current_time = datetime.now(_WAT)
+        parts.append(f"\n_Updated at: {current_time.strftime('%Y-%m-%d %I:%M:%S %p')} WAT_")
         
         payload = {
-            "text": message
+            "text": "".join(parts)
         }
         
-        print("Sending webhook request...")
-        response = requests.post(webhook_url, json=payload, timeout=10)  # Add timeout
+        # Serialize once as raw UTF-8; requests' json= would escape every
+        # emoji and arrow as \uXXXX sequences
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        logger.info("Sending webhook request...")
+        response = _SESSION.post(
+            webhook_url,
+            data=body,
+            headers={'Content-Type': 'application/json; charset=UTF-8'},
+            timeout=10
+        )
         response.raise_for_status()  # Raise exception for bad status codes
-        print(f"Webhook response status: {response.status_code}")
+        logger.info("Webhook response status: %s", response.status_code)
         return True
     except requests.exceptions.RequestException as e:
-        print(f"Error sending alert to Google Space: {str(e)}")
+        logger.error("Error sending alert to Google Space: %s", e)
         return False
 
 def load_previous_state():
     """Load previous state from file."""
-    print("Checking for previous state file")
+    logger.debug("Checking for previous state file")
     try:
+        if not os.path.exists(PREVIOUS_STATE_FILE) and os.path.exists(LEGACY_STATE_FILE):
+            migrate_legacy_state()
         if os.path.exists(PREVIOUS_STATE_FILE):
-            print(f"Loading previous state from {PREVIOUS_STATE_FILE}")
-            with open(PREVIOUS_STATE_FILE, 'rb') as f:
-                data = pickle.load(f)
-                if not data or len(data) < 3:
-                    print("Invalid state data found, treating as no previous state")
+            logger.debug("Loading previous state from %s", PREVIOUS_STATE_FILE)
+            with open(PREVIOUS_STATE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                # Raw sheet rows written before the state had a schema
+                if len(data) < 3:
+                    logger.warning("Invalid state data found, treating as no previous state")
                     return None
-                print("Previous state loaded successfully")
-                return data
-        print("No previous state file found")
+                state = parse_legacy_rows(data)
+            elif isinstance(data, dict) and data.get('version') == STATE_VERSION:
+                state = ParsedSheet(
+                    headers=data['headers'],
+                    values=data['values'],
+                    total=data['total'],
+                    digest=bytes.fromhex(data['digest'])
+                )
+            else:
+                logger.warning("Invalid state data found, treating as no previous state")
+                return None
+            logger.info("Previous state loaded successfully")
+            return state
+        logger.info("No previous state file found")
         return None
     except Exception as e:
-        print(f"Error loading previous state: {str(e)}")
+        logger.error("Error loading previous state: %s", e)
         return None
 
+def parse_legacy_rows(data):
+    """Parse raw rows from an older state file into a ParsedSheet.
+
+    Those rows hold display strings, so numeric cells in the weights row are
+    converted back to floats to compare cleanly with unformatted values.
+    """
+    rows = list(data)
+    if rows:
+        rows[0] = [
+            float(str(v).strip().replace(',', ''))
+            if isinstance(v, str) and _LEGACY_NUM_RE(v.strip()) else v
+            for v in rows[0]
+        ]
+    return parse_sheet(rows)
+
+def migrate_legacy_state():
+    """Rewrite a pickled state file from an older version as JSON."""
+    logger.info("Migrating legacy state file %s", LEGACY_STATE_FILE)
+    try:
+        with open(LEGACY_STATE_FILE, 'rb') as f:
+            data = pickle.load(f)
+        save_current_state(parse_legacy_rows(data))
+        os.remove(LEGACY_STATE_FILE)
+        logger.info("Legacy state migrated successfully")
+    except Exception as e:
+        logger.error("Error migrating legacy state: %s", e)
+
 def save_current_state(state):
-    """Save current state to file."""
-    if not state or len(state) < 3:
-        print("Invalid state data, skipping save")
+    """Save a ParsedSheet to the state file as a versioned dict."""
+    if not state or not state.headers:
+        logger.warning("Invalid state data, skipping save")
         return
         
-    print("Saving current state")
+    logger.debug("Saving current state")
     try:
-        os.makedirs(os.path.dirname(PREVIOUS_STATE_FILE), exist_ok=True)
-        with open(PREVIOUS_STATE_FILE, 'wb') as f:
-            pickle.dump(state, f)
-        print(f"State saved successfully to {PREVIOUS_STATE_FILE}")
+        # Write to a temp file and rename so an interrupted run can never
+        # leave a truncated state file behind
+        tmp_file = PREVIOUS_STATE_FILE + '.tmp'
+        data = asdict(state)
+        data['digest'] = state.digest.hex()
+        data['version'] = STATE_VERSION
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, PREVIOUS_STATE_FILE)
+        logger.info("State saved successfully to %s", PREVIOUS_STATE_FILE)
     except Exception as e:
-        print(f"Error saving state: {str(e)}")
+        logger.error("Error saving state: %s", e)
         raise APIError("Failed to save state file")
 
-def detect_changes(previous_data, current_data):
-    """Detect changes between previous and current data."""
-    if not previous_data:
-        print("No previous data available")
+def detect_changes(previous, current):
+    """Detect changes between previous and current parsed sheets."""
+    if not previous:
+        logger.info("No previous data available")
         return []
     
     try:
         changes = []
-        # Get part headers from row 2 (starting from column C which is index 2)
-        part_headers = []
-        if len(current_data) > 1 and len(current_data[1]) > 2:
-            part_headers = current_data[1][2:]  # Skip empty cell and PARTS TYPE
-        
-        # Get previous values from row 1 (starting from column C which is index 2)
-        prev_values = []
-        if len(previous_data) > 0 and len(previous_data[0]) > 2:
-            prev_values = previous_data[0][2:]  # Skip DATE and TOTAL WEIGHTS
-        
-        # Get current values from row 1 (starting from column C which is index 2)
-        curr_values = []
-        if len(current_data) > 0 and len(current_data[0]) > 2:
-            curr_values = current_data[0][2:]  # Skip DATE and TOTAL WEIGHTS
-        
-        # Validate data structure
-        if len(part_headers) != len(curr_values):
-            print(f"Warning: Mismatch between parts ({len(part_headers)}) and values ({len(curr_values)})")
-            # Use the shorter length for comparison
-            compare_length = min(len(part_headers), len(curr_values))
-            # Trim the arrays to the same length
-            part_headers = part_headers[:compare_length]
-            curr_values = curr_values[:compare_length]
-            prev_values = prev_values[:compare_length] if len(prev_values) > compare_length else prev_values
+        # Pad previous values so parts added since the last run compare
+        # against an empty cell; zip stops at the current values
+        prev_values = previous.values + [''] * (len(current.values) - len(previous.values))
         
-        # If previous values array is shorter than current, pad it
-        if len(prev_values) < len(curr_values):
-            print(f"Warning: Previous values array ({len(prev_values)}) shorter than current ({len(curr_values)})")
-            # Pad with empty strings
-            prev_values = prev_values + [''] * (len(curr_values) - len(prev_values))
-        # If previous values array is longer, trim it
-        elif len(prev_values) > len(curr_values):
-            print(f"Warning: Previous values array ({len(prev_values)}) longer than current ({len(curr_values)})")
-            prev_values = prev_values[:len(curr_values)]
-            
-        print("\nComparing states...")
+        logger.debug("Comparing states...")
         
         # Compare each value and detect changes
-        for i in range(len(part_headers)):
-            if i >= len(prev_values) or i >= len(curr_values):
-                print(f"Warning: Index {i} out of bounds. Skipping comparison.")
-                continue
-                
-            # Convert both values to strings for comparison to avoid type mismatches
-            prev_val = str(prev_values[i]).strip()
-            curr_val = str(curr_values[i]).strip()
-            
-            if prev_val != curr_val:
-                changes.append((part_headers[i], prev_values[i], curr_values[i]))
-                print(f"Change detected in {part_headers[i]}")
+        for part, prev_val, curr_val in zip(current.headers, prev_values, current.values):
+            if _values_differ(prev_val, curr_val):
+                changes.append((part, prev_val, curr_val))
+                logger.debug("Change detected in %s", part)
         
         # Also check if total weight changed
-        if len(previous_data[0]) > 1 and len(current_data[0]) > 1:
-            prev_total = str(previous_data[0][1]).strip()  # TOTAL WEIGHTS
-            curr_total = str(current_data[0][1]).strip()   # TOTAL WEIGHTS
-            
-            if prev_total != curr_total:
-                changes.append(("TOTAL WEIGHTS", previous_data[0][1], current_data[0][1]))
-                print("Change detected in TOTAL WEIGHTS")
+        if previous.total is not None and current.total is not None:
+            if _values_differ(previous.total, current.total):
+                changes.append(("TOTAL WEIGHTS", previous.total, current.total))
+                logger.debug("Change detected in TOTAL WEIGHTS")
         
         if changes:
-            print(f"Detected {len(changes)} changes")
+            logger.info("Detected %d changes", len(changes))
         else:
-            print("No changes detected in parts weights")
+            logger.info("No changes detected in parts weights")
         return changes
     except Exception as e:
-        print(f"Error detecting changes: {str(e)}")
-        print("Attempting to reset state file for next run...")
-        # Save current state to recover from this error
-        save_current_state(current_data)
-        print("State file updated with current data. Next run should work correctly.")
-        # Don't propagate the exception, just return empty changes
+        logger.error("Error detecting changes: %s", e)
+        # Don't propagate the exception, just return empty changes;
+        # main() saves the current state afterwards
         return []
 
 def main():
@@ -247,50 +399,80 @@ def main():
         webhook_url = os.environ.get('SPACE_WEBHOOK_URL')
         if not webhook_url:
             raise ValueError("SPACE_WEBHOOK_URL environment variable not set")
-        print("Webhook URL configured")
+        logger.debug("Webhook URL configured")
 
         # Initialize the Sheets API service
-        print("Initializing Google Sheets service...")
+        logger.info("Initializing Google Sheets service...")
         service = get_service()
         
-        # Get current sheet data
-        current_data = get_sheet_data(service)
+        # Skip the run entirely if the spreadsheet hasn't been modified
+        modified_time = get_modified_time(get_drive_service())
+        if (modified_time and os.path.exists(PREVIOUS_STATE_FILE)
+                and modified_time == load_previous_mtime()):
+            logger.info("Spreadsheet unchanged since %s, nothing to do", modified_time)
+            return
+        
+        # Fetch current sheet data and load previous state concurrently,
+        # the state read and parse overlap with the Sheets round-trip
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            current_future = executor.submit(get_sheet_data, service)
+            previous_future = executor.submit(load_previous_state)
+            current_data = current_future.result()
+            previous = previous_future.result()
+        current = parse_sheet(current_data)
         
-        # Load previous state
-        previous_data = load_previous_state()
+        # Skip the comparison if the weights row is unchanged. This needs a
+        # valid loaded state, so a corrupt state file is always rewritten.
+        if previous and current.digest == previous.digest:
+            logger.info("No changes detected in parts weights")
+            if modified_time:
+                save_current_mtime(modified_time)
+            return
         
-        if not previous_data:
+        if not previous:
             # First run - just save the initial state without sending alert
-            print("No previous state found, initializing state file...")
-            save_current_state(current_data)
-            print("Initial state saved successfully")
+            logger.info("No previous state found, initializing state file...")
+            save_current_state(current)
+            logger.info("Initial state saved successfully")
         else:
             # Check for changes
-            print("Checking for changes...")
+            logger.info("Checking for changes...")
             try:
-                changes = detect_changes(previous_data, current_data)
+                changes = detect_changes(previous, current)
                 if changes:
-                    print("Changes detected, sending alert...")
-                    if send_space_alert(webhook_url, changes=changes, current_data=current_data):
-                        save_current_state(current_data)
+                    logger.info("Changes detected, sending alert...")
+                    if send_space_alert(webhook_url, changes=changes, current=current):
+                        save_current_state(current)
                     else:
-                        print("Failed to send change alert, but continuing execution")
-                        save_current_state(current_data)
+                        logger.warning("Failed to send change alert, but continuing execution")
+                        save_current_state(current)
                 else:
-                    print("No changes detected, updating state file...")
-                    save_current_state(current_data)
+                    logger.info("No changes detected, updating state file...")
+                    save_current_state(current)
             except Exception as e:
-                print(f"Error during change detection or alerting: {str(e)}")
-                print("Saving current state to recover on next run...")
-                save_current_state(current_data)
+                logger.error("Error during change detection or alerting: %s", e)
+                logger.info("Saving current state to recover on next run...")
+                save_current_state(current)
+
+        if modified_time:
+            save_current_mtime(modified_time)
 
     except APIError as e:
-        print(f"API Error: {str(e)}")
+        logger.error("API Error: %s", e)
         # Don't exit with error to avoid GitHub Actions failure
         # Just log the error and continue
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
         # Don't exit with error to avoid GitHub Actions failure
 
 if __name__ == '__main__':
+    log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    # getLevelName returns an int only for registered level names
+    valid_level = isinstance(logging.getLevelName(log_level), int)
+    logging.basicConfig(
+        level=log_level if valid_level else logging.INFO,
+        format='%(levelname)s: %(message)s'
+    )
+    if not valid_level:
+        logger.warning("Invalid LOG_LEVEL %r, falling back to INFO", log_level)
     main() 
\ No newline at end of file